@@ -0,0 +1,6 @@
+"""
+beets-lastfm-bridge
+Genre tagging for beets libraries using Last.fm
+"""
+
+__version__ = "0.2.0"
@@ -0,0 +1,7 @@
+"""Allows running the package with python -m beets_lastfm_bridge"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,168 @@
+"""
+Adaptive lookup statistics for beets-lastfm-bridge
+Records Last.fm hit rates per level and skips levels that are unlikely to succeed
+"""
+
+import json
+import math
+import os
+
+LEVELS = ("track", "album", "artist")
+
+# A level is skipped once even an optimistic estimate of its hit rate
+# (upper confidence bound) is below this value
+SKIP_BELOW = 0.1
+CONFIDENCE_Z = 1.28
+# The global rate is only trusted once this many artists were tried
+MIN_GLOBAL_ARTISTS = 10
+# Per-artist rates need at least this many attempts
+MIN_ARTIST_ATTEMPTS = 5
+# Skipped levels are still tried every Nth time to notice changes
+PROBE_EVERY_GLOBAL = 25
+PROBE_EVERY_ARTIST = 10
+# Counts kept between runs are scaled down to these sizes so old runs fade out
+MAX_GLOBAL_HISTORY = 1000
+MAX_ARTIST_HISTORY = 50
+
+def upper_bound(hits, attempts, z=CONFIDENCE_Z):
+    """Wilson score upper bound of a hit rate"""
+    if attempts <= 0:
+        return 1.0
+    rate = hits / attempts
+    denominator = 1 + z * z / attempts
+    center = rate + z * z / (2 * attempts)
+    margin = z * math.sqrt(rate * (1 - rate) / attempts + z * z / (4 * attempts * attempts))
+    return (center + margin) / denominator
+
+def _scaled(counts, maximum):
+    attempts, hits = counts
+    if attempts <= maximum:
+        return [attempts, hits]
+    factor = maximum / attempts
+    return [attempts * factor, hits * factor]
+
+class LevelStats:
+    """Hit rates per lookup level, globally and per artist
+    
+    attempts, hits and the skip counts describe the current run. Counts
+    loaded from earlier runs are only used for decisions.
+    """
+    
+    def __init__(self, adaptive=True):
+        self.adaptive = adaptive
+        self.attempts = dict.fromkeys(LEVELS, 0)
+        self.hits = dict.fromkeys(LEVELS, 0)
+        self.skipped_global = dict.fromkeys(LEVELS, 0)
+        self.skipped_artist = dict.fromkeys(LEVELS, 0)
+        self._run_artist = {}
+        self._history_global = {level: [0, 0] for level in LEVELS}
+        self._history_artist = {}
+        self._artists = {level: set() for level in LEVELS}
+        self._since_probe = {}
+    
+    def record(self, level, artist, hit):
+        """Records the outcome of a lookup"""
+        key = (artist.lower(), level)
+        self.attempts[level] += 1
+        counts = self._run_artist.setdefault(key, [0, 0])
+        counts[0] += 1
+        if hit:
+            self.hits[level] += 1
+            counts[1] += 1
+        self._artists[level].add(key[0])
+    
+    def counts(self, level, artist=None):
+        """Attempts and hits including earlier runs, globally or for one artist"""
+        if artist is None:
+            history = self._history_global[level]
+            return history[0] + self.attempts[level], history[1] + self.hits[level]
+        key = (artist.lower(), level)
+        history = self._history_artist.get(key, (0, 0))
+        run = self._run_artist.get(key, (0, 0))
+        return history[0] + run[0], history[1] + run[1]
+    
+    def _probe(self, key, every):
+        """True every Nth time a skip is considered for key"""
+        self._since_probe[key] = self._since_probe.get(key, 0) + 1
+        if self._since_probe[key] >= every:
+            self._since_probe[key] = 0
+            return True
+        return False
+    
+    def should_try(self, level, artist):
+        """Decides whether a level is worth a request for this artist"""
+        # The artist level is the last fallback and always tried
+        if not self.adaptive or level == "artist":
+            return True
+        
+        # Per-artist history wins over the global rate
+        attempts, hits = self.counts(level, artist)
+        if attempts >= MIN_ARTIST_ATTEMPTS:
+            if upper_bound(hits, attempts) >= SKIP_BELOW:
+                return True
+            if self._probe((artist.lower(), level), PROBE_EVERY_ARTIST):
+                return True
+            self.skipped_artist[level] += 1
+            return False
+        
+        if len(self._artists[level]) < MIN_GLOBAL_ARTISTS:
+            return True
+        attempts, hits = self.counts(level)
+        if upper_bound(hits, attempts) >= SKIP_BELOW:
+            return True
+        if self._probe(level, PROBE_EVERY_GLOBAL):
+            return True
+        self.skipped_global[level] += 1
+        return False
+    
+    def merge(self, other):
+        """Adds the current-run counts of another LevelStats, e.g. from a worker"""
+        for level in LEVELS:
+            self.attempts[level] += other.attempts[level]
+            self.hits[level] += other.hits[level]
+            self.skipped_global[level] += other.skipped_global[level]
+            self.skipped_artist[level] += other.skipped_artist[level]
+        for key, (attempts, hits) in other._run_artist.items():
+            counts = self._run_artist.setdefault(key, [0, 0])
+            counts[0] += attempts
+            counts[1] += hits
+            self._artists[key[1]].add(key[0])
+    
+    def load(self, path):
+        """Loads counts from earlier runs, ignoring a missing or broken file"""
+        if not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            for level in LEVELS:
+                self._history_global[level] = list(data["global"][level])
+                for artist, counts in data["artists"][level].items():
+                    self._history_artist[(artist, level)] = list(counts)
+                    self._artists[level].add(artist)
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+    
+    def save(self, path):
+        """Stores the counts of earlier runs and this run for the next run"""
+        data = {"global": {}, "artists": {level: {} for level in LEVELS}}
+        for level in LEVELS:
+            data["global"][level] = _scaled(self.counts(level), MAX_GLOBAL_HISTORY)
+        for artist, level in set(self._history_artist) | set(self._run_artist):
+            data["artists"][level][artist] = _scaled(self.counts(level, artist), MAX_ARTIST_HISTORY)
+        with open(path, 'w') as f:
+            json.dump(data, f)
+    
+    def summary_lines(self):
+        """Formats per-level statistics for the run summary"""
+        lines = []
+        for level in LEVELS:
+            attempts, hits = self.attempts[level], self.hits[level]
+            rate = f"{hits / attempts:.1%}" if attempts else "n/a"
+            skipped = self.skipped_global[level] + self.skipped_artist[level]
+            line = f"  {level:<6} {attempts} tried, {hits} hits ({rate})"
+            if skipped:
+                line += (f", {skipped} skipped ({self.skipped_global[level]} global,"
+                         f" {self.skipped_artist[level]} per artist)")
+            lines.append(line)
+        return lines
@@ -0,0 +1,73 @@
+"""
+Genre Batch Processor for beets-lastfm-bridge
+Runs all genre stages in sequence for automated workflow
+"""
+
+from . import finder, mapper, splitter
+
+STAGES = [
+    ('genre finder', finder.run),
+    ('genre mapper', mapper.run),
+    ('genre splitter', splitter.run)
+]
+
+def run_stage(name, func):
+    """Runs a stage in-process and shows status"""
+    print(f"\n{'='*60}")
+    print(f"Starting: {name}")
+    print(f"{'='*60}")
+    
+    try:
+        if func():
+            print(f"\n✓ {name} completed successfully")
+            return True
+        print(f"\n✗ {name} did not complete")
+        return False
+    except KeyboardInterrupt:
+        print(f"\n⚠ {name} cancelled by user")
+        return False
+    except Exception as e:
+        print(f"\n✗ Error in {name}: {type(e).__name__}: {e}")
+        return False
+
+def main(args):
+    print("Genre Batch Processing")
+    print("=" * 30)
+    print("Will run in sequence:")
+    for i, (name, _) in enumerate(STAGES, 1):
+        print(f"{i}. {name}")
+    print()
+    
+    # User confirmation
+    if not args.yes:
+        response = input("Do you want to continue? (y/N): ").lower()
+        if response not in ['y', 'yes']:
+            print("Cancelled")
+            return 0
+    
+    success_count = 0
+    
+    for i, (name, func) in enumerate(STAGES, 1):
+        print(f"\nStep {i}/{len(STAGES)}:")
+        if run_stage(name, func):
+            success_count += 1
+        else:
+            print(f"\nError running {name}")
+            if args.yes:
+                continue
+            response = input("Continue with next stage? (y/N): ").lower()
+            if response not in ['y', 'yes']:
+                break
+    
+    print(f"\n{'='*60}")
+    print("SUMMARY")
+    print(f"{'='*60}")
+    print(f"Successful: {success_count}/{len(STAGES)} stages")
+    
+    if success_count == len(STAGES):
+        print("✓ All stages completed successfully!")
+    else:
+        print("⚠ Not all stages completed successfully")
+        
+    print("\nGenre processing completed")
+    return 0 if success_count == len(STAGES) else 1
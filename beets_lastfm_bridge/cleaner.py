@@ -0,0 +1,103 @@
+"""
+Genre Cleaner for beets-lastfm-bridge
+Removes unwanted genres from existing collection based on blacklist
+"""
+
+import time
+
+from . import library
+from .config import load_blacklist, is_blacklisted, split_genre_string
+from .incremental import build_genre_index, affected_song_ids, load_snapshot, save_snapshot
+
+def run(full=False):
+    """Removes unwanted genres from existing collection
+    
+    After a first run, only songs whose genre contains a new blacklist
+    entry and songs added since the last run are checked. Rules are checked
+    once per distinct genre; only songs with a blacklisted genre are loaded,
+    modified and written.
+    """
+    blacklist = load_blacklist(create_missing=False)
+    
+    if not blacklist["contains"] and not blacklist["exact"]:
+        print("No blacklist entries found")
+        return True
+    
+    started = time.time()
+    snapshot = None if full else load_snapshot("blacklist")
+    
+    # Read only IDs and genres; with a snapshot, only candidates are read.
+    # Removed entries never require changes, so only new ones are searched.
+    if snapshot is None:
+        songs = library.list_genres()
+    else:
+        previous, last_run = snapshot
+        added = [term for kind in ("contains", "exact") for term in blacklist[kind]
+                 if term not in previous.get(kind, [])]
+        songs = library.list_genres(added, added_after=last_run)
+        print(f"{len(added)} new blacklist entries, checking songs with them or added since the last run")
+    
+    if songs is None:
+        print("Error retrieving songs")
+        return False
+    
+    index = build_genre_index(songs)
+    
+    affected_genres, affected_ids = affected_song_ids(
+        index, lambda genre: is_blacklisted(genre, blacklist)
+    )
+    genres_by_id = dict(songs)
+    
+    print(f"{len(affected_genres)} of {len(index)} genres are blacklisted")
+    
+    changes = {}
+    items = library.get_items(sorted(affected_ids, key=int))
+    total_songs = len(items)
+    
+    print(f"Processing {total_songs} songs...")
+    
+    for i, item in enumerate(items, 1):
+        # Split genres and filter
+        current_genres = genres_by_id[str(item.id)]
+        genres = split_genre_string(current_genres)
+        filtered_genres = []
+        removed_genres = []
+        
+        for genre in genres:
+            if is_blacklisted(genre, blacklist):
+                removed_genres.append(genre)
+            else:
+                filtered_genres.append(genre)
+        
+        # Only update if genres were removed
+        if removed_genres:
+            new_genre_string = ", ".join(filtered_genres)
+            
+            print(f"[{i}/{total_songs}] {item.albumartist} - {item.album} - {item.title}")
+            print(f"  Removed: {', '.join(removed_genres)}")
+            if filtered_genres:
+                print(f"  Kept: {', '.join(filtered_genres)}")
+            else:
+                print(f"  All genres removed")
+            
+            changes[str(item.id)] = new_genre_string
+        elif i % 500 == 0:
+            print(f"[{i}/{total_songs}] Processed...")
+    
+    # Store all changes in one transaction and write them to the files
+    if changes:
+        print("\nWriting changes to files...")
+        cleaned_count = library.set_genres(changes)
+    else:
+        cleaned_count = 0
+    
+    save_snapshot("blacklist", blacklist, started)
+    
+    print(f"\nGenres cleaned for {cleaned_count} songs")
+    print("Done!")
+    return True
+
+def main(args):
+    print("Genre cleaning for existing collection")
+    print("=" * 45)
+    return 0 if run(args.full) else 1
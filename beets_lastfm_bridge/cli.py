@@ -0,0 +1,73 @@
+"""
+Command line interface for beets-lastfm-bridge
+Subcommand modules are imported only when they are run to keep startup fast
+"""
+
+import argparse
+import importlib
+import sys
+
+from . import __version__
+from .lastfm import DEFAULT_RATE
+
+# Subcommand name -> module implementing main(args)
+COMMANDS = {
+    'find': 'finder',
+    'map': 'mapper',
+    'clean': 'cleaner',
+    'split': 'splitter',
+    'batch': 'batch',
+    'debug': 'debug'
+}
+
+def build_parser():
+    """Builds the argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(
+        prog='beets-lastfm-bridge',
+        description="Genre tagging for beets libraries using Last.fm"
+    )
+    parser.add_argument('--version', action='version', version=f"%(prog)s {__version__}")
+    subparsers = parser.add_subparsers(dest='command', metavar='COMMAND')
+    
+    find = subparsers.add_parser('find', help="Find genres on Last.fm for tracks without genres")
+    find.add_argument('--api-key', action='append',
+                      help="Last.fm API key (default: $LASTFM_API_KEY), repeat to spread workers over keys")
+    find.add_argument('--no-adaptive', action='store_true',
+                      help="Always try every lookup level instead of skipping levels that rarely succeed")
+    find.add_argument('--workers', type=int, default=1,
+                      help="Number of worker processes, sharded by album artist (default: 1)")
+    find.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                      help=f"Maximum requests per second per API key (default: {DEFAULT_RATE:g})")
+    find.add_argument('--cache', metavar='PATH',
+                      help="SQLite file caching Last.fm results (default with --workers: ~/.config/beets/lastfm_cache.db)")
+    find.add_argument('--api-url', help="Last.fm API URL, e.g. of a stub server (default: $LASTFM_API_URL)")
+    
+    for name, help_text in [('map', "Apply genre mappings to existing genres"),
+                            ('clean', "Remove blacklisted genres from existing genres")]:
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--full', action='store_true',
+                             help="Check all songs instead of only those affected by rule changes or new imports")
+    subparsers.add_parser('split', help="Split comma-separated genres into separate FLAC tags")
+    
+    batch = subparsers.add_parser('batch', help="Run find, map and split in sequence")
+    batch.add_argument('-y', '--yes', action='store_true', help="Don't ask for confirmation")
+    
+    debug = subparsers.add_parser('debug', help="Show all or unmapped genres")
+    debug.add_argument('mode', choices=['all', 'new'],
+                       help="all: show all genres, new: show genres not in mapping JSON")
+    
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    if not args.command:
+        parser.print_help()
+        return 2
+    
+    module = importlib.import_module(f'.{COMMANDS[args.command]}', __package__)
+    return module.main(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+Shared configuration loaders for beets-lastfm-bridge
+Blacklist and genre mapping files live in ~/.config/beets/
+"""
+
+import json
+import os
+
+CONFIG_DIR = os.path.expanduser("~/.config/beets")
+MAPPING_FILE = os.path.join(CONFIG_DIR, "genre_mapping.json")
+BLACKLIST_FILE = os.path.join(CONFIG_DIR, "genre_blacklist.json")
+STATS_FILE = os.path.join(CONFIG_DIR, "lookup_stats.json")
+SNAPSHOT_FILE = os.path.join(CONFIG_DIR, "genre_rules_snapshot.json")
+
+def load_genre_mapping(create_missing=True):
+    """Loads genre mappings from configuration file"""
+    if not os.path.exists(MAPPING_FILE):
+        if create_missing:
+            with open(MAPPING_FILE, 'w') as f:
+                json.dump({}, f, indent=2)
+            print(f"Empty genre mapping file created: {MAPPING_FILE}")
+        return {}
+    
+    with open(MAPPING_FILE, 'r') as f:
+        return json.load(f)
+
+def load_blacklist(create_missing=True):
+    """Loads blacklist from configuration file"""
+    if not os.path.exists(BLACKLIST_FILE):
+        if create_missing:
+            with open(BLACKLIST_FILE, 'w') as f:
+                json.dump({"contains": [], "exact": []}, f, indent=2)
+            print(f"Empty blacklist file created: {BLACKLIST_FILE}")
+        return {"contains": [], "exact": []}
+    
+    with open(BLACKLIST_FILE, 'r') as f:
+        data = json.load(f)
+    
+    # Backwards compatibility for old array structure
+    if isinstance(data, list):
+        return {"contains": [term.lower() for term in data], "exact": []}
+    
+    # New object structure
+    return {
+        "contains": [term.lower() for term in data.get("contains", [])],
+        "exact": [term.lower() for term in data.get("exact", [])]
+    }
+
+def is_blacklisted(genre, blacklist):
+    """Checks if a genre is blacklisted or contains numbers"""
+    genre_lower = genre.lower().strip()
+    
+    # Check if genre is exactly in the exact list
+    if genre_lower in blacklist["exact"]:
+        return True
+    
+    # Check if genre contains any term from the contains list
+    for blacklisted_term in blacklist["contains"]:
+        if blacklisted_term in genre_lower:
+            return True
+    
+    # Check if genre contains numbers
+    return any(char.isdigit() for char in genre)
+
+def filter_blacklisted_genres(genres, blacklist):
+    """Removes genres that are blacklisted or contain numbers"""
+    return [genre for genre in genres if not is_blacklisted(genre, blacklist)]
+
+def apply_genre_mapping(genres, mapping):
+    """Applies genre mapping to a list of new genres from Last.fm"""
+    return [mapping.get(genre.lower(), genre.title()) for genre in genres]
+
+def split_genre_string(genre_string):
+    """Splits a comma-separated genre string into single genres"""
+    return [g.strip() for g in genre_string.split(',')]
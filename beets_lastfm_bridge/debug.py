@@ -0,0 +1,54 @@
+"""
+Debug Genre List for beets-lastfm-bridge
+Shows all genres or unmapped genres for analysis
+"""
+
+from . import library
+from .config import load_genre_mapping, split_genre_string
+
+def get_all_genres():
+    """Gets all genres from beets library"""
+    items = library.list_items(['genre'])
+    if items is None:
+        print("Error retrieving genres from beets")
+        return []
+    
+    all_genres = set()
+    for (genre_string,) in items:
+        # Split comma-separated genres
+        all_genres.update(split_genre_string(genre_string))
+    
+    return sorted(g for g in all_genres if g)
+
+def main(args):
+    print("Collecting all genres from music collection...")
+    all_genres = get_all_genres()
+    
+    if not all_genres:
+        print("No genres found in music collection")
+        return 0
+    
+    if args.mode == 'all':
+        print(f"\nAll genres in music collection ({len(all_genres)}):")
+        print("=" * 50)
+        for i, genre in enumerate(all_genres, 1):
+            print(f"{i:3d}. {genre}")
+    
+    elif args.mode == 'new':
+        mapping = load_genre_mapping(create_missing=False)
+        mapped_genres = set(mapping.keys())
+        
+        # Find genres not in mapping file
+        new_genres = [genre for genre in all_genres if genre.lower() not in mapped_genres]
+        
+        if new_genres:
+            print(f"\nGenres not in mapping file ({len(new_genres)}):")
+            print("=" * 50)
+            for i, genre in enumerate(new_genres, 1):
+                print(f"{i:3d}. {genre}")
+        else:
+            print("\nAll genres are already in mapping file")
+            print("No new genres found")
+    
+    print(f"\nTotal: {len(all_genres)} different genres in collection")
+    return 0
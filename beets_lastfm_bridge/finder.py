@@ -0,0 +1,184 @@
+"""
+Genre Finder for beets-lastfm-bridge
+Discovers genres from Last.fm with hierarchical Track → Album → Artist fallback
+"""
+
+import os
+
+from . import library
+from .adaptive import LevelStats
+from .lastfm import LastfmClient, TagCache, DEFAULT_RATE
+from .config import STATS_FILE, load_blacklist, load_genre_mapping, filter_blacklisted_genres, apply_genre_mapping
+
+# Configuration - Replace with your Last.fm API credentials or set LASTFM_API_KEY
+API_KEY = "YOUR_LASTFM_API_KEY_HERE"
+
+def get_api_key():
+    """Returns the Last.fm API key from the environment or this module"""
+    return os.environ.get("LASTFM_API_KEY", API_KEY)
+
+def _genres_from_tags(tags, min_genres, blacklist, mapping):
+    """Filters and maps the first three tags, None if too few remain"""
+    filtered_genres = filter_blacklisted_genres(tags[:3], blacklist)
+    if len(filtered_genres) < min_genres:
+        return None
+    return ", ".join(apply_genre_mapping(filtered_genres, mapping))
+
+def lookup_track_genres(artist, track, blacklist, mapping, client):
+    """Track-level lookup, needs at least 2 usable track tags"""
+    tags = client.top_tags("track.gettoptags", artist=artist, track=track)
+    if len(tags) < 2:
+        return None
+    return _genres_from_tags(tags, 2, blacklist, mapping)
+
+def lookup_album_genres(artist, album, blacklist, mapping, client):
+    """Album-level lookup, needs at least 1 usable album tag"""
+    tags = client.top_tags("album.gettoptags", artist=artist, album=album)
+    return _genres_from_tags(tags, 1, blacklist, mapping)
+
+def lookup_artist_genres(artist, blacklist, mapping, client):
+    """Artist-level lookup, needs at least 1 usable artist tag"""
+    tags = client.top_tags("artist.gettoptags", artist=artist)
+    return _genres_from_tags(tags, 1, blacklist, mapping)
+
+def get_genres_from_lastfm(artist, track=None, album=None, blacklist=None, mapping=None, client=None, stats=None):
+    """Gets genres from Last.fm with hierarchy: Track → Album → Artist
+    
+    With stats, levels predicted to fail are skipped and outcomes are recorded,
+    except for levels answered from the client's cache.
+    """
+    if blacklist is None:
+        blacklist = load_blacklist()
+    if mapping is None:
+        mapping = load_genre_mapping()
+    if client is None:
+        client = LastfmClient(get_api_key())
+    
+    levels = []
+    if track:
+        levels.append(("track", {"artist": artist, "track": track},
+                       lambda: lookup_track_genres(artist, track, blacklist, mapping, client)))
+    if album:
+        levels.append(("album", {"artist": artist, "album": album},
+                       lambda: lookup_album_genres(artist, album, blacklist, mapping, client)))
+    levels.append(("artist", {"artist": artist},
+                   lambda: lookup_artist_genres(artist, blacklist, mapping, client)))
+    
+    for level, params, lookup in levels:
+        # Cached answers cost no request, so they are never skipped or counted
+        counted = stats is not None and not client.is_cached(f"{level}.gettoptags", **params)
+        if counted and not stats.should_try(level, artist):
+            continue
+        
+        try:
+            genres = lookup()
+        except Exception as e:
+            if level == "artist":
+                print(f"Error for {artist}: {e}")
+            continue
+        
+        if counted:
+            stats.record(level, artist, bool(genres))
+        if genres:
+            return genres, level
+    
+    return None, None
+
+def get_tracks_without_genres():
+    """Gets all tracks without genres from beets"""
+    items = library.list_items(['albumartist', 'album', 'title', 'id'], ['genre::^$'])
+    if items is None:
+        print("Error retrieving tracks from beets")
+        return []
+    
+    return [
+        {'artist': albumartist, 'album': album, 'title': title, 'id': track_id}
+        for albumartist, album, title, track_id in items
+    ]
+
+def check_api_key(api_key):
+    """Prints setup instructions if the API key is still the placeholder"""
+    if api_key == "YOUR_LASTFM_API_KEY_HERE":
+        print("Error: Please configure your Last.fm API key")
+        print("Set LASTFM_API_KEY or pass --api-key")
+        print("Get your API key at: https://www.last.fm/api/account/create")
+        return False
+    return True
+
+def run(api_key=None, adaptive=True, api_url=None, cache_path=None, rate=DEFAULT_RATE):
+    """Finds and sets genres for all tracks without genres"""
+    api_key = api_key or get_api_key()
+    if not check_api_key(api_key):
+        return False
+    
+    print("Searching for tracks without genres...")
+    tracks = get_tracks_without_genres()
+    
+    if not tracks:
+        print("No tracks without genres found")
+        return True
+    
+    print(f"Found: {len(tracks)} tracks")
+    
+    # Load configuration once for the whole run
+    blacklist = load_blacklist()
+    mapping = load_genre_mapping()
+    stats = LevelStats(adaptive=adaptive)
+    stats.load(STATS_FILE)
+    cache = TagCache(cache_path) if cache_path else None
+    client = LastfmClient(api_key, api_url=api_url, cache=cache, rate=rate)
+    found = {}
+    cancelled = False
+    
+    try:
+        for i, track in enumerate(tracks, 1):
+            print(f"[{i}/{len(tracks)}] {track['artist']} - {track['title']}")
+            
+            genres, source = get_genres_from_lastfm(
+                track['artist'],
+                track['title'],
+                track['album'],
+                blacklist=blacklist,
+                mapping=mapping,
+                client=client,
+                stats=stats
+            )
+            
+            if genres:
+                found[track['id']] = genres
+                print(f"  ✓ Genres found ({source}): {genres}")
+            else:
+                print(f"  - No genres found")
+    except KeyboardInterrupt:
+        print("\nCancelled, saving the genres found so far")
+        cancelled = True
+    
+    print("\nLookup statistics:")
+    for line in stats.summary_lines():
+        print(line)
+    stats.save(STATS_FILE)
+    
+    # Same single commit as the sharded mode
+    if found:
+        print(f"\nSetting genres for {len(found)} tracks and writing files...")
+        updated = library.set_genres(found)
+        print(f"Genres set for {updated} tracks")
+    else:
+        print("\nNo genres found")
+    
+    print("Done!")
+    return not cancelled
+
+def main(args):
+    api_keys = args.api_key or [get_api_key()]
+    options = dict(
+        adaptive=not args.no_adaptive,
+        api_url=args.api_url,
+        cache_path=args.cache,
+        rate=args.rate
+    )
+    
+    if args.workers > 1:
+        from . import sharded
+        return 0 if sharded.run(api_keys, args.workers, **options) else 1
+    return 0 if run(api_key=api_keys[0], **options) else 1
@@ -0,0 +1,56 @@
+"""
+Incremental rule updates for beets-lastfm-bridge
+Remembers the rules applied by the last run and finds the affected songs
+through a genre → song ID index
+"""
+
+import json
+import os
+
+from .config import SNAPSHOT_FILE, split_genre_string
+
+def load_snapshot(name):
+    """Returns the rules and start time of the last run, None if unknown"""
+    if not os.path.exists(SNAPSHOT_FILE):
+        return None
+    
+    try:
+        with open(SNAPSHOT_FILE, 'r') as f:
+            snapshot = json.load(f)[name]
+        return snapshot["rules"], float(snapshot["time"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_snapshot(name, rules, started):
+    """Stores the rules that were just applied and when the run started"""
+    snapshots = {}
+    if os.path.exists(SNAPSHOT_FILE):
+        try:
+            with open(SNAPSHOT_FILE, 'r') as f:
+                snapshots = json.load(f)
+        except (OSError, ValueError):
+            snapshots = {}
+    
+    snapshots[name] = {"rules": rules, "time": started}
+    with open(SNAPSHOT_FILE, 'w') as f:
+        json.dump(snapshots, f, indent=2)
+
+def build_genre_index(songs):
+    """Maps each genre to the IDs of the songs that have it"""
+    index = {}
+    for song_id, genre_string in songs:
+        for genre in split_genre_string(genre_string):
+            if genre:
+                index.setdefault(genre, set()).add(song_id)
+    return index
+
+def affected_song_ids(index, is_affected):
+    """Returns affected genres and the IDs of all songs that have one of them
+    
+    is_affected is evaluated once per distinct genre, not once per song.
+    """
+    genres = [genre for genre in index if is_affected(genre)]
+    song_ids = set()
+    for genre in genres:
+        song_ids.update(index[genre])
+    return genres, song_ids
@@ -0,0 +1,140 @@
+"""
+Last.fm API access for beets-lastfm-bridge
+Top tag requests with optional rate limiting and a shared result cache
+"""
+
+import json
+import os
+import time
+
+API_URL = "http://ws.audioscrobbler.com/2.0/"
+
+# Last.fm asks for no more than 5 requests per second per API key
+DEFAULT_RATE = 5.0
+
+# Cache lifetime in seconds for tag results and for empty results
+TAGS_TTL = 30 * 24 * 3600
+EMPTY_TTL = 12 * 3600
+
+# Last.fm error code for an unknown artist, album or track
+NOT_FOUND = 6
+
+def get_api_url():
+    """Returns the Last.fm API URL, LASTFM_API_URL allows a stub server"""
+    return os.environ.get("LASTFM_API_URL", API_URL)
+
+class LastfmError(Exception):
+    """Error response from Last.fm such as a rate limit or an invalid API key"""
+    
+    def __init__(self, code, message):
+        super().__init__(f"Last.fm error {code}: {message}")
+        self.code = code
+
+class RateLimiter:
+    """Spaces out calls to at most rate calls per second"""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+    
+    def wait(self):
+        now = time.monotonic()
+        if now < self._next:
+            time.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
+
+class TagCache:
+    """SQLite cache of raw Last.fm tags, safe to share between processes
+    
+    Entries expire after ttl seconds. Empty results expire after the much
+    shorter empty_ttl, so releases that gain tags on Last.fm are asked
+    again on a later run.
+    """
+    
+    def __init__(self, path, ttl=TAGS_TTL, empty_ttl=EMPTY_TTL):
+        import sqlite3
+        
+        self.ttl = ttl
+        self.empty_ttl = empty_ttl
+        self.connection = sqlite3.connect(path, timeout=30)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS toptags ("
+            "key TEXT PRIMARY KEY, tags TEXT NOT NULL, fetched REAL NOT NULL)"
+        )
+        self.connection.commit()
+    
+    @staticmethod
+    def make_key(method, params):
+        return json.dumps([method, sorted((k, v.lower()) for k, v in params.items())])
+    
+    def get(self, method, params):
+        """Cached tags, None if missing or expired"""
+        row = self.connection.execute(
+            "SELECT tags, fetched FROM toptags WHERE key = ?", (self.make_key(method, params),)
+        ).fetchone()
+        if not row:
+            return None
+        
+        tags = json.loads(row[0])
+        ttl = self.ttl if tags else self.empty_ttl
+        if time.time() - row[1] > ttl:
+            return None
+        return tags
+    
+    def set(self, method, params, tags):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO toptags (key, tags, fetched) VALUES (?, ?, ?)",
+                (self.make_key(method, params), json.dumps(tags), time.time())
+            )
+
+class LastfmClient:
+    """Requests top tag names from Last.fm"""
+    
+    def __init__(self, api_key, api_url=None, cache=None, rate=None):
+        self.api_key = api_key
+        self.api_url = api_url or get_api_url()
+        self.cache = cache
+        self.limiter = RateLimiter(rate) if rate else None
+        self.requests = 0
+    
+    def is_cached(self, method, **params):
+        """True if top_tags would answer from the cache without a request"""
+        return self.cache is not None and self.cache.get(method, params) is not None
+    
+    def top_tags(self, method, **params):
+        """Requests the top tag names for a Last.fm method
+        
+        Unknown artists, albums and tracks give an empty, cached result.
+        Other errors raise LastfmError and are not cached.
+        """
+        if self.cache:
+            tags = self.cache.get(method, params)
+            if tags is not None:
+                return tags
+        
+        import requests
+        
+        if self.limiter:
+            self.limiter.wait()
+        self.requests += 1
+        response = requests.get(self.api_url, params={
+            **params,
+            "method": method,
+            "api_key": self.api_key,
+            "format": "json"
+        }, timeout=10)
+        data = response.json()
+        
+        # Rate limits, outages or an invalid API key must not end up in the cache
+        if "error" in data and data["error"] != NOT_FOUND:
+            raise LastfmError(data["error"], data.get("message", ""))
+        
+        tags = []
+        if "toptags" in data and "tag" in data["toptags"]:
+            tags = [tag["name"] for tag in data["toptags"]["tag"]]
+        if self.cache:
+            self.cache.set(method, params, tags)
+        return tags
@@ -0,0 +1,114 @@
+"""
+beets library access for beets-lastfm-bridge
+beets is imported on first use and the library is opened once per process
+"""
+
+_library = None
+
+def open_library():
+    """Opens the beets library from the user's beets configuration"""
+    global _library
+    if _library is None:
+        from beets import config
+        from beets.library import Library
+        
+        _library = Library(config['library'].as_filename(), config['directory'].as_filename())
+    return _library
+
+def list_items(fields, query=()):
+    """Lists items as tuples of the requested fields, None on error
+    
+    Values are formatted like `beet ls -f`, query uses beets query syntax.
+    """
+    from beets.dbcore.db import DBAccessError
+    
+    try:
+        items = open_library().items(list(query))
+    except DBAccessError:
+        return None
+    
+    rows = []
+    for item in items:
+        formatted = item.formatted()
+        rows.append(tuple(formatted[field] for field in fields))
+    return rows
+
+def list_genres(terms=None, added_after=None):
+    """Lists (id, genre) pairs of items with a genre, None on error
+    
+    Only the id and genre columns are read, without building Item objects.
+    With terms or added_after, only items whose genre contains one of the
+    terms (case-insensitive for ASCII) or that were added after the
+    timestamp are listed.
+    """
+    from beets.dbcore.db import DBAccessError
+    
+    statement = "SELECT id, genre FROM items WHERE genre != ''"
+    subvals = []
+    if terms is not None or added_after is not None:
+        conditions = []
+        for term in terms or ():
+            escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            conditions.append("genre LIKE ? ESCAPE '\\'")
+            subvals.append(f"%{escaped}%")
+        if added_after is not None:
+            conditions.append("added > ?")
+            subvals.append(added_after)
+        if not conditions:
+            return []
+        statement += " AND (" + " OR ".join(conditions) + ")"
+    
+    try:
+        with open_library().transaction() as tx:
+            rows = tx.query(statement, subvals)
+    except DBAccessError:
+        return None
+    return [(str(item_id), genre) for item_id, genre in rows]
+
+def get_items(item_ids):
+    """Loads the items with the given IDs, skipping removed ones"""
+    lib = open_library()
+    items = []
+    for item_id in item_ids:
+        item = lib.get_item(int(item_id))
+        if item is not None:
+            items.append(item)
+    return items
+
+def set_genres(genres_by_id):
+    """Sets genres for many items in one transaction, then writes the files
+    
+    Returns the number of items updated in the database.
+    """
+    lib = open_library()
+    items = []
+    
+    with lib.transaction():
+        for item_id, genres in genres_by_id.items():
+            item = lib.get_item(int(item_id))
+            if item is None:
+                continue
+            item.genre = genres
+            item.store()
+            items.append(item)
+    
+    for item in items:
+        item.try_write()
+    return len(items)
+
+def update_items(item_ids):
+    """Reads tags from the files of the given items back into the database"""
+    from beets.library import ReadError
+    
+    lib = open_library()
+    
+    with lib.transaction():
+        for item_id in item_ids:
+            item = lib.get_item(int(item_id))
+            if item is None:
+                continue
+            try:
+                item.read()
+            except ReadError:
+                continue
+            item.store()
@@ -0,0 +1,93 @@
+"""
+Genre Mapper for beets-lastfm-bridge
+Applies genre name mappings to existing genres in your collection
+"""
+
+import time
+
+from . import library
+from .config import load_genre_mapping, split_genre_string
+from .incremental import build_genre_index, affected_song_ids, load_snapshot, save_snapshot
+
+def map_genres(genres, mapping):
+    """Maps existing genres, keeping unmapped names unchanged"""
+    return [mapping.get(genre.lower(), genre) for genre in genres]
+
+def run(full=False):
+    """Updates existing genres affected by the mapping file
+    
+    After a first run, only songs whose genre contains a changed mapping
+    and songs added since the last run are checked. Rules are checked once
+    per distinct genre; only songs with a mapped genre are loaded, modified
+    and written.
+    """
+    mapping = load_genre_mapping()
+    
+    if not mapping:
+        print("No mappings found in file")
+        return True
+    
+    started = time.time()
+    snapshot = None if full else load_snapshot("mapping")
+    
+    # Read only IDs and genres; with a snapshot, only candidates are read
+    if snapshot is None:
+        songs = library.list_genres()
+    else:
+        previous, last_run = snapshot
+        changed = [source for source, target in mapping.items() if previous.get(source) != target]
+        songs = library.list_genres(changed, added_after=last_run)
+        print(f"{len(changed)} changed mappings, checking songs with them or added since the last run")
+    
+    if songs is None:
+        print("Error retrieving songs")
+        return False
+    
+    index = build_genre_index(songs)
+    
+    affected_genres, affected_ids = affected_song_ids(
+        index, lambda genre: mapping.get(genre.lower(), genre) != genre
+    )
+    genres_by_id = dict(songs)
+    
+    print(f"{len(affected_genres)} of {len(index)} genres need mapping")
+    
+    changes = {}
+    items = library.get_items(sorted(affected_ids, key=int))
+    total_songs = len(items)
+    
+    print(f"Processing {total_songs} songs...")
+    
+    for i, item in enumerate(items, 1):
+        # Split genres and apply mapping
+        current_genres = genres_by_id[str(item.id)]
+        genres = split_genre_string(current_genres)
+        mapped_genres = map_genres(genres, mapping)
+        
+        # Only update if something changed
+        if mapped_genres != genres:
+            new_genre_string = ", ".join(mapped_genres)
+            
+            print(f"[{i}/{total_songs}] {item.albumartist} - {item.album} - {item.title}")
+            print(f"  {current_genres} -> {new_genre_string}")
+            
+            changes[str(item.id)] = new_genre_string
+        elif i % 500 == 0:
+            print(f"[{i}/{total_songs}] Processed...")
+    
+    # Store all changes in one transaction and write them to the files
+    if changes:
+        print("\nWriting changes to files...")
+        updated_count = library.set_genres(changes)
+    else:
+        updated_count = 0
+    
+    save_snapshot("mapping", mapping, started)
+    
+    print(f"\nGenres updated for {updated_count} songs")
+    print("Done!")
+    return True
+
+def main(args):
+    print("Updating existing genres based on mapping file...")
+    return 0 if run(args.full) else 1
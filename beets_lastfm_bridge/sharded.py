@@ -0,0 +1,162 @@
+"""
+Sharded Genre Finder for beets-lastfm-bridge
+Splits tracks by album artist over worker processes, each with its own
+API key and rate limiter, and merges all results in one library commit
+"""
+
+import os
+import signal
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import library
+from .adaptive import LevelStats
+from .config import CONFIG_DIR, STATS_FILE, load_blacklist, load_genre_mapping
+from .finder import get_tracks_without_genres, get_genres_from_lastfm, check_api_key
+from .lastfm import LastfmClient, TagCache, DEFAULT_RATE
+
+DEFAULT_CACHE = os.path.join(CONFIG_DIR, "lastfm_cache.db")
+
+def shard_for(albumartist, shards):
+    """Stable shard number, so album and artist lookups stay in one shard"""
+    return zlib.crc32(albumartist.lower().encode('utf-8')) % shards
+
+def partition(tracks, shards):
+    """Splits tracks into shards by album artist"""
+    parts = [[] for _ in range(shards)]
+    for track in tracks:
+        parts[shard_for(track['artist'], shards)].append(track)
+    return parts
+
+def ignore_interrupts():
+    """Worker initializer: idle workers ignore Ctrl+C, run_shard handles it"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def run_shard(shard, tracks, api_key, api_url, cache_path, rate, adaptive):
+    """Worker process: looks up genres for one shard
+    
+    Returns the shard number, a {track ID: genres} dict, the lookup
+    statistics, the number of requests sent to Last.fm and whether the
+    shard was cancelled with Ctrl+C before all tracks were looked up.
+    """
+    blacklist = load_blacklist(create_missing=False)
+    mapping = load_genre_mapping(create_missing=False)
+    stats = LevelStats(adaptive=adaptive)
+    stats.load(STATS_FILE)
+    client = LastfmClient(api_key, api_url=api_url, cache=TagCache(cache_path), rate=rate)
+    
+    results = {}
+    cancelled = False
+    previous_handler = signal.signal(signal.SIGINT, signal.default_int_handler)
+    try:
+        for i, track in enumerate(tracks, 1):
+            genres, _ = get_genres_from_lastfm(
+                track['artist'],
+                track['title'],
+                track['album'],
+                blacklist=blacklist,
+                mapping=mapping,
+                client=client,
+                stats=stats
+            )
+            if genres:
+                results[track['id']] = genres
+            if i % 100 == 0:
+                print(f"[shard {shard}] {i}/{len(tracks)} tracks")
+    except KeyboardInterrupt:
+        cancelled = True
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+    
+    return shard, results, stats, client.requests, cancelled
+
+def merge_shard(future, shards, genres_by_id, stats):
+    """Adds the results of a finished shard to the run, False if it failed"""
+    try:
+        shard, results, shard_stats, requests_sent, cancelled = future.result()
+    except Exception as e:
+        print(f"  ✗ Shard failed: {e}")
+        return False
+    
+    genres_by_id.update(results)
+    stats.merge(shard_stats)
+    mark = "-" if cancelled else "✓"
+    note = " (cancelled)" if cancelled else ""
+    print(f"  {mark} Shard {shard}{note}: genres for {len(results)}/{len(shards[shard])} tracks, "
+          f"{requests_sent} requests")
+    return True
+
+def run(api_keys, workers, adaptive=True, api_url=None, cache_path=None, rate=DEFAULT_RATE):
+    """Finds genres with several workers and sets them in one commit"""
+    for api_key in api_keys:
+        if not check_api_key(api_key):
+            return False
+    
+    print("Searching for tracks without genres...")
+    tracks = get_tracks_without_genres()
+    
+    if not tracks:
+        print("No tracks without genres found")
+        return True
+    
+    # Create missing config files once, before the workers read them
+    load_blacklist()
+    load_genre_mapping()
+    cache_path = cache_path or DEFAULT_CACHE
+    TagCache(cache_path)
+    
+    # Workers sharing an API key share its rate limit
+    key_users = [sum(1 for w in range(workers) if w % len(api_keys) == k) for k in range(len(api_keys))]
+    
+    shards = partition(tracks, workers)
+    print(f"Found: {len(tracks)} tracks in {workers} shards "
+          f"({', '.join(str(len(shard)) for shard in shards)} tracks)")
+    
+    genres_by_id = {}
+    stats = LevelStats(adaptive=adaptive)
+    stats.load(STATS_FILE)
+    failed_shards = 0
+    cancelled = False
+    merged = set()
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=ignore_interrupts) as executor:
+        futures = []
+        for shard, shard_tracks in enumerate(shards):
+            if not shard_tracks:
+                continue
+            key = shard % len(api_keys)
+            futures.append(executor.submit(
+                run_shard, shard, shard_tracks, api_keys[key], api_url,
+                cache_path, rate / key_users[key], adaptive
+            ))
+        
+        try:
+            for future in as_completed(futures):
+                merged.add(future)
+                if not merge_shard(future, shards, genres_by_id, stats):
+                    failed_shards += 1
+        except KeyboardInterrupt:
+            print("\nCancelled, saving the genres found so far")
+            cancelled = True
+            # Shards not started yet are dropped, running ones were
+            # interrupted too and return what they found
+            for future in futures:
+                if future in merged or future.cancel():
+                    continue
+                if not merge_shard(future, shards, genres_by_id, stats):
+                    failed_shards += 1
+    
+    print("\nLookup statistics:")
+    for line in stats.summary_lines():
+        print(line)
+    stats.save(STATS_FILE)
+    
+    if genres_by_id:
+        print(f"\nSetting genres for {len(genres_by_id)} tracks and writing files...")
+        updated = library.set_genres(genres_by_id)
+        print(f"Genres set for {updated} tracks")
+    else:
+        print("\nNo genres found")
+    
+    print("Done!")
+    return failed_shards == 0 and not cancelled
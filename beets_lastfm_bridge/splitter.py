@@ -0,0 +1,85 @@
+"""
+Genre Splitter for beets-lastfm-bridge
+Splits comma-separated genres into separate FLAC tags
+"""
+
+import os
+import subprocess
+
+from . import library
+from .config import split_genre_string
+
+def run():
+    """Splits comma-separated genres into separate FLAC tags"""
+    
+    # Find all FLAC files with comma-separated genres
+    flac_files = library.list_items(['path', 'id'], ['genre:,'])
+    if flac_files is None:
+        print("Error retrieving FLAC files")
+        return False
+    
+    if not flac_files:
+        print("No files with comma-separated genres found")
+        return True
+    
+    total_files = len(flac_files)
+    converted_ids = []
+    
+    print(f"Processing {total_files} files with comma-separated genres...")
+    
+    for i, (file_path, item_id) in enumerate(flac_files, 1):
+        if not os.path.exists(file_path):
+            continue
+            
+        try:
+            # Read current genres
+            result = subprocess.run(
+                ['metaflac', '--show-tag=GENRE', file_path],
+                capture_output=True, text=True, check=True
+            )
+            
+            if not result.stdout.strip():
+                continue
+                
+            # Take first GENRE tag (should be the comma-separated one)
+            genre_line = result.stdout.strip().split('\n')[0]
+            if '=' not in genre_line:
+                continue
+                
+            current_genres = genre_line.split('=', 1)[1]
+            
+            # Only process if commas are present
+            if ',' in current_genres:
+                print(f"[{i}/{total_files}] Converting: {os.path.basename(file_path)}")
+                
+                # Replace all GENRE tags with one tag per genre in a single call
+                genres = [g for g in split_genre_string(current_genres) if g]
+                subprocess.run(
+                    ['metaflac', '--remove-tag=GENRE',
+                     *[f'--set-tag=GENRE={genre}' for genre in genres], file_path],
+                    check=True, capture_output=True
+                )
+                
+                print(f"  {current_genres} -> {len(genres)} separate tags")
+                converted_ids.append(item_id)
+                
+            elif i % 1000 == 0:
+                print(f"[{i}/{total_files}] Processed...")
+                
+        except subprocess.CalledProcessError:
+            continue
+    
+    print(f"\nResult:")
+    print(f"- {len(converted_ids)} files converted")
+    print(f"- Genres were split into separate tags")
+    
+    # Update beets database
+    print("\nUpdating beets database...")
+    library.update_items(converted_ids)
+    print("Done!")
+    return True
+
+def main(args):
+    print("Genre Splitter for FLAC files")
+    print("=" * 35)
+    return 0 if run() else 1
@@ -0,0 +1,181 @@
+"""
+beets plugin for beets-lastfm-bridge
+Tags genres from Last.fm at import time using the finder, mapping and blacklist
+"""
+
+from beets.importer import action
+from beets.plugins import BeetsPlugin
+
+from beets_lastfm_bridge import finder
+from beets_lastfm_bridge.config import load_blacklist, load_genre_mapping
+from beets_lastfm_bridge.lastfm import LastfmClient, DEFAULT_RATE
+
+class LastfmBridgePlugin(BeetsPlugin):
+    def __init__(self):
+        super().__init__()
+        self.config.add({
+            'auto': True,
+            'force': False,
+            'track_lookups': True,
+            'apikey': ''
+        })
+        self.config['apikey'].redact = True
+        
+        self.blacklist = None
+        self.mapping = None
+        self.client = None
+        self._artist_cache = {}
+        
+        if self.config['auto'].get(bool):
+            self.import_stages = [self.imported]
+            self.register_listener('import_begin', self.load_rules)
+    
+    def load_rules(self, session=None):
+        """Loads blacklist and mapping once per import session"""
+        self.blacklist = load_blacklist()
+        self.mapping = load_genre_mapping()
+        self.client = LastfmClient(self.api_key, rate=DEFAULT_RATE)
+        self._artist_cache = {}
+    
+    @property
+    def api_key(self):
+        return self.config['apikey'].as_str() or finder.get_api_key()
+    
+    def _lookup(self, func, *args):
+        """Runs a single Last.fm lookup, None on any error"""
+        try:
+            return func(*args, self.blacklist, self.mapping, self.client)
+        except Exception as e:
+            self._log.debug('Last.fm lookup failed: {0}', e)
+            return None
+    
+    def artist_genres(self, artist):
+        """Artist-level genres, looked up once per artist per session"""
+        if artist not in self._artist_cache:
+            self._artist_cache[artist] = self._lookup(finder.lookup_artist_genres, artist)
+        return self._artist_cache[artist]
+    
+    def album_genres(self, album):
+        """Album → Artist fallback for a whole album"""
+        genres = self._lookup(finder.lookup_album_genres, album.albumartist, album.album)
+        if genres:
+            return genres, 'album'
+        genres = self.artist_genres(album.albumartist)
+        if genres:
+            return genres, 'artist'
+        return None, None
+    
+    def track_genres(self, item):
+        """Track-level genres only, None if Last.fm has too few track tags"""
+        if not item.title:
+            return None
+        return self._lookup(finder.lookup_track_genres, item.artist, item.title)
+    
+    def is_mixed_album(self, album, items):
+        """Compilations and multi-artist albums are tagged per track"""
+        return album.comp or len({item.artist for item in items}) > 1
+    
+    def imported(self, session, task):
+        """Import stage: sets genres before beets writes the files
+        
+        beets only writes tags for autotagged (applied) or retagged
+        imports, so for as-is imports the changed items are written here.
+        """
+        if self.blacklist is None:
+            self.load_rules()
+        
+        if self.api_key == "YOUR_LASTFM_API_KEY_HERE":
+            self._log.warning('No Last.fm API key configured, skipping')
+            return
+        
+        if task.is_album:
+            changed = self.tag_album(task.album, task.imported_items())
+        else:
+            changed = self.tag_singleton(task.item)
+        
+        beets_writes = task.apply or task.choice_flag == action.RETAG
+        if changed and session.config['write'] and not beets_writes:
+            for item in changed:
+                item.try_write()
+    
+    def tag_album(self, album, items):
+        """One album-level lookup, mixed albums are tagged per track
+        
+        Returns the items whose genre was changed.
+        """
+        force = self.config['force'].get(bool)
+        untagged = [item for item in items if force or not item.genre]
+        
+        if not untagged:
+            return []
+        
+        if self.is_mixed_album(album, items):
+            return self.tag_mixed_album(album, untagged)
+        
+        genres, source = self.album_genres(album)
+        if not genres:
+            self._log.info('{0} - {1}: no genres found', album.albumartist, album.album)
+            return []
+        
+        self._log.info('{0} - {1}: {2} ({3})', album.albumartist, album.album, genres, source)
+        if len(untagged) == len(items):
+            # Album store passes the genre on to every track
+            album.genre = genres
+            album.store()
+            return list(album.items())
+        
+        # Keep the genres some tracks already have
+        for item in untagged:
+            item.genre = genres
+            item.store()
+        return untagged
+    
+    def tag_mixed_album(self, album, items):
+        """Track → Track Artist → Album fallback for each track
+        
+        The album artist (e.g. Various Artists) is never used here.
+        """
+        album_tags = None
+        album_looked_up = False
+        changed = []
+        
+        for item in items:
+            genres, source = None, None
+            if self.config['track_lookups'].get(bool):
+                genres, source = self.track_genres(item), 'track'
+            if not genres:
+                genres, source = self.artist_genres(item.artist), 'artist'
+            if not genres:
+                if not album_looked_up:
+                    album_tags = self._lookup(finder.lookup_album_genres, album.albumartist, album.album)
+                    album_looked_up = True
+                genres, source = album_tags, 'album'
+            
+            if genres:
+                item.genre = genres
+                item.store()
+                changed.append(item)
+                self._log.info('{0} - {1}: {2} ({3})', item.artist, item.title, genres, source)
+            else:
+                self._log.info('{0} - {1}: no genres found', item.artist, item.title)
+        
+        return changed
+    
+    def tag_singleton(self, item):
+        """Track → Artist fallback for singleton imports, returns changed items"""
+        if item.genre and not self.config['force'].get(bool):
+            return []
+        
+        genres, source = None, None
+        if self.config['track_lookups'].get(bool):
+            genres, source = self.track_genres(item), 'track'
+        if not genres:
+            genres, source = self.artist_genres(item.artist), 'artist'
+        
+        if not genres:
+            return []
+        
+        item.genre = genres
+        item.store()
+        self._log.info('{0} - {1}: {2} ({3})', item.artist, item.title, genres, source)
+        return [item]
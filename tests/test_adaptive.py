@@ -0,0 +1,151 @@
+"""Tests for the adaptive lookup statistics"""
+
+from beets_lastfm_bridge import adaptive
+from beets_lastfm_bridge.adaptive import LevelStats, upper_bound
+from beets_lastfm_bridge.finder import get_genres_from_lastfm
+from beets_lastfm_bridge.lastfm import LastfmClient, TagCache
+
+def record_many(stats, level, artists, hits_per_artist, attempts_per_artist):
+    for artist in artists:
+        for i in range(attempts_per_artist):
+            stats.record(level, artist, i < hits_per_artist)
+
+def test_upper_bound_is_optimistic():
+    assert upper_bound(0, 0) == 1.0
+    assert upper_bound(3, 33) > 3 / 33
+    assert upper_bound(0, 50) < adaptive.SKIP_BELOW
+
+def test_artist_level_is_always_tried():
+    stats = LevelStats()
+    record_many(stats, "artist", [f"a{i}" for i in range(20)], 0, 10)
+    assert stats.should_try("artist", "a1")
+
+def test_global_rate_needs_several_artists():
+    stats = LevelStats()
+    # Many misses, but all from one artist
+    record_many(stats, "track", ["only"], 0, 100)
+    assert stats.should_try("track", "someone else")
+
+def test_global_skip_after_consistent_misses():
+    stats = LevelStats()
+    record_many(stats, "track", [f"a{i}" for i in range(40)], 0, 3)
+    assert not stats.should_try("track", "new artist")
+    assert stats.skipped_global["track"] == 1
+
+def test_moderate_hit_rate_is_not_skipped():
+    # Roughly 9% hits on a small sample must not be taken as a miss rate
+    stats = LevelStats()
+    artists = [f"a{i}" for i in range(33)]
+    for i, artist in enumerate(artists):
+        stats.record("track", artist, i % 11 == 0)
+    assert stats.should_try("track", "new artist")
+
+def test_global_skips_are_probed():
+    stats = LevelStats()
+    record_many(stats, "track", [f"a{i}" for i in range(40)], 0, 3)
+    decisions = [stats.should_try("track", "new artist") for _ in range(adaptive.PROBE_EVERY_GLOBAL)]
+    assert decisions.count(True) == 1
+
+def test_artist_history_overrides_global():
+    stats = LevelStats()
+    record_many(stats, "track", [f"a{i}" for i in range(40)], 0, 3)
+    record_many(stats, "track", ["popular"], 5, 5)
+    assert stats.should_try("track", "Popular")
+
+def test_artist_skip_needs_enough_misses_and_is_probed():
+    stats = LevelStats()
+    record_many(stats, "album", ["obscure"], 0, 2)
+    assert stats.should_try("album", "obscure")
+    
+    record_many(stats, "album", ["obscure"], 0, 30)
+    decisions = [stats.should_try("album", "obscure") for _ in range(adaptive.PROBE_EVERY_ARTIST)]
+    assert decisions.count(True) == 1
+    assert stats.skipped_artist["album"] == adaptive.PROBE_EVERY_ARTIST - 1
+
+def test_no_adaptive_tries_everything():
+    stats = LevelStats(adaptive=False)
+    record_many(stats, "track", [f"a{i}" for i in range(40)], 0, 3)
+    assert stats.should_try("track", "a1")
+
+def test_merge_adds_run_counts():
+    first, second = LevelStats(), LevelStats()
+    first.record("track", "A", True)
+    second.record("track", "A", False)
+    second.record("album", "B", True)
+    second.skipped_global["track"] = 2
+    
+    first.merge(second)
+    
+    assert first.attempts["track"] == 2
+    assert first.hits["track"] == 1
+    assert first.attempts["album"] == 1
+    assert first.skipped_global["track"] == 2
+    assert first.counts("track", "a") == (2, 1)
+    assert first.counts("album", "b") == (1, 1)
+
+def test_merge_does_not_duplicate_history(tmp_path):
+    path = str(tmp_path / "stats.json")
+    previous = LevelStats()
+    record_many(previous, "track", ["A"], 1, 4)
+    previous.save(path)
+    
+    parent, worker = LevelStats(), LevelStats()
+    parent.load(path)
+    worker.load(path)
+    worker.record("track", "A", True)
+    parent.merge(worker)
+    
+    assert parent.counts("track", "A") == (5, 2)
+    assert parent.attempts["track"] == 1
+
+def test_history_is_used_for_decisions(tmp_path):
+    path = str(tmp_path / "stats.json")
+    previous = LevelStats()
+    record_many(previous, "track", [f"a{i}" for i in range(40)], 0, 3)
+    previous.save(path)
+    
+    stats = LevelStats()
+    stats.load(path)
+    assert not stats.should_try("track", "new artist")
+    assert stats.attempts["track"] == 0
+
+def test_saved_history_is_capped(tmp_path):
+    path = str(tmp_path / "stats.json")
+    stats = LevelStats()
+    record_many(stats, "track", [f"a{i}" for i in range(10)], 100, 200)
+    stats.save(path)
+    
+    loaded = LevelStats()
+    loaded.load(path)
+    attempts, hits = loaded.counts("track")
+    assert attempts == adaptive.MAX_GLOBAL_HISTORY
+    assert hits == adaptive.MAX_GLOBAL_HISTORY / 2
+    assert loaded.counts("track", "a1")[0] == adaptive.MAX_ARTIST_HISTORY
+
+def test_broken_history_is_ignored(tmp_path):
+    path = tmp_path / "stats.json"
+    path.write_text("{not json")
+    stats = LevelStats()
+    stats.load(str(path))
+    assert stats.counts("track") == (0, 0)
+
+def test_cached_levels_are_not_skipped_or_counted(tmp_path):
+    cache = TagCache(str(tmp_path / "cache.db"))
+    cache.set("track.gettoptags", {"artist": "A", "track": "Hit"}, ["Emo", "Screamo"])
+    cache.set("track.gettoptags", {"artist": "A", "track": "Miss"}, [])
+    cache.set("album.gettoptags", {"artist": "A", "album": "B"}, ["Emo"])
+    # Fails if a request is sent
+    client = LastfmClient("key", api_url="http://127.0.0.1:9/", cache=cache)
+    empty = {"contains": [], "exact": []}
+    
+    stats = LevelStats()
+    record_many(stats, "track", ["A"], 0, 20)
+    assert not stats.should_try("track", "A")
+    attempts = dict(stats.attempts)
+    skipped = dict(stats.skipped_artist)
+    
+    assert get_genres_from_lastfm("A", "Hit", "B", empty, {}, client, stats) == ("Emo, Screamo", "track")
+    assert get_genres_from_lastfm("A", "Miss", "B", empty, {}, client, stats) == ("Emo", "album")
+    assert stats.attempts == attempts
+    assert stats.skipped_artist == skipped
+    assert client.requests == 0
@@ -0,0 +1,131 @@
+"""Tests for the genre index and the mapper/cleaner song selection"""
+
+import time
+
+import pytest
+
+from beets_lastfm_bridge import cleaner, incremental, library, mapper
+from beets_lastfm_bridge.incremental import build_genre_index, affected_song_ids
+
+def test_build_genre_index():
+    index = build_genre_index([
+        ("1", "Hip Hop, seen live"),
+        ("2", "Hip Hop"),
+        ("3", ""),
+        ("4", "Rock,  Hip Hop")
+    ])
+    assert index == {
+        "Hip Hop": {"1", "2", "4"},
+        "seen live": {"1"},
+        "Rock": {"4"}
+    }
+
+def test_affected_song_ids_checks_each_genre_once():
+    index = build_genre_index([("1", "Hip Hop, seen live"), ("2", "seen live"), ("3", "Rock")])
+    checked = []
+    
+    def is_affected(genre):
+        checked.append(genre)
+        return genre == "seen live"
+    
+    genres, song_ids = affected_song_ids(index, is_affected)
+    
+    assert genres == ["seen live"]
+    assert song_ids == {"1", "2"}
+    assert sorted(checked) == ["Hip Hop", "Rock", "seen live"]
+
+@pytest.fixture
+def lib(monkeypatch, tmp_path):
+    """In-memory beets library used by map and clean, without file writes"""
+    beets_library = pytest.importorskip("beets.library")
+    lib = beets_library.Library(':memory:')
+    monkeypatch.setattr(library, "_library", lib)
+    monkeypatch.setattr(beets_library.Item, "try_write", lambda self, *args, **kwargs: None)
+    monkeypatch.setattr(incremental, "SNAPSHOT_FILE", str(tmp_path / "snapshot.json"))
+    return lib
+
+def add_song(lib, genre, added=None):
+    """Adds a song and returns its ID as listed by list_genres"""
+    from beets.library import Item
+    
+    item = Item(title="Title", album="Album", albumartist="Artist", genre=genre)
+    lib.add(item)
+    # Library.add stamps the current time
+    if added is not None:
+        item.added = added
+        item.store()
+    return str(item.id)
+
+def genres(lib):
+    return {str(item.id): item.genre for item in lib.items()}
+
+def test_list_genres_reads_only_candidates(lib):
+    old = time.time() - 100
+    hip_hop = add_song(lib, "HIP HOP, Rock", added=old)
+    percent = add_song(lib, "100% Metal", added=old)
+    jazz = add_song(lib, "Jazz", added=old)
+    add_song(lib, "", added=old)
+    new = add_song(lib, "Jazz")
+    
+    assert sorted(library.list_genres()) == sorted(
+        [(hip_hop, "HIP HOP, Rock"), (percent, "100% Metal"), (jazz, "Jazz"), (new, "Jazz")]
+    )
+    assert library.list_genres(["hip hop"]) == [(hip_hop, "HIP HOP, Rock")]
+    # LIKE wildcards in terms are matched literally
+    assert library.list_genres(["0%"]) == [(percent, "100% Metal")]
+    assert library.list_genres(["_"]) == []
+    assert library.list_genres(["rock"], added_after=old + 50) == [(hip_hop, "HIP HOP, Rock"), (new, "Jazz")]
+    assert library.list_genres([]) == []
+
+def test_mapper_fixes_new_songs_with_unchanged_rules(lib, monkeypatch):
+    first = add_song(lib, "Post-Hardcore", added=time.time() - 100)
+    second = add_song(lib, "hip hop, seen live", added=time.time() - 100)
+    monkeypatch.setattr(mapper, "load_genre_mapping", lambda: {"hip hop": "Hip Hop"})
+    
+    assert mapper.run()
+    # Running again with the same rules must still pick up songs added since
+    third = add_song(lib, "hip hop")
+    assert mapper.run()
+    
+    assert genres(lib) == {first: "Post-Hardcore", second: "Hip Hop, seen live", third: "Hip Hop"}
+
+def test_cleaner_fixes_new_songs_with_unchanged_rules(lib, monkeypatch):
+    first = add_song(lib, "Hip Hop, seen live", added=time.time() - 100)
+    second = add_song(lib, "Rock", added=time.time() - 100)
+    monkeypatch.setattr(
+        cleaner, "load_blacklist",
+        lambda create_missing=True: {"contains": ["seen live"], "exact": []}
+    )
+    
+    assert cleaner.run()
+    third = add_song(lib, "Jazz, seen live, 80s")
+    assert cleaner.run()
+    
+    assert genres(lib) == {first: "Hip Hop", second: "Rock", third: "Jazz"}
+
+def test_mapper_checks_changed_rules_and_full(lib, monkeypatch):
+    old = time.time() - 100
+    mapping = {"hip hop": "Hip Hop"}
+    monkeypatch.setattr(mapper, "load_genre_mapping", lambda: mapping)
+    assert mapper.run()
+    
+    # Edited outside an import with unchanged rules: only found with full
+    edited = add_song(lib, "hip hop", added=old)
+    # Matches a new rule: found without full
+    changed = add_song(lib, "rnb", added=old)
+    mapping["rnb"] = "R&B"
+    
+    assert mapper.run()
+    assert genres(lib) == {edited: "hip hop", changed: "R&B"}
+    
+    assert mapper.run(full=True)
+    assert genres(lib) == {edited: "Hip Hop", changed: "R&B"}
+
+def test_nothing_written_without_changes(lib, monkeypatch):
+    add_song(lib, "Hip Hop")
+    written = []
+    monkeypatch.setattr(library, "set_genres", lambda changes: written.append(changes))
+    monkeypatch.setattr(mapper, "load_genre_mapping", lambda: {"hip hop": "Hip Hop"})
+    
+    assert mapper.run()
+    assert written == []
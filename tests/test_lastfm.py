@@ -0,0 +1,70 @@
+"""Tests for the Last.fm client and its shared result cache"""
+
+import time
+
+import pytest
+
+from beets_lastfm_bridge.lastfm import LastfmClient, LastfmError, TagCache
+
+def test_cache_roundtrip_is_case_insensitive(tmp_path):
+    cache = TagCache(str(tmp_path / "cache.db"))
+    cache.set("artist.gettoptags", {"artist": "Architects"}, ["Metalcore"])
+    assert cache.get("artist.gettoptags", {"artist": "architects"}) == ["Metalcore"]
+    assert cache.get("album.gettoptags", {"artist": "Architects"}) is None
+
+def test_empty_results_expire_early(tmp_path, monkeypatch):
+    cache = TagCache(str(tmp_path / "cache.db"), ttl=1000, empty_ttl=10)
+    cache.set("track.gettoptags", {"artist": "A", "track": "T"}, [])
+    cache.set("artist.gettoptags", {"artist": "A"}, ["Shoegaze"])
+    assert cache.get("track.gettoptags", {"artist": "A", "track": "T"}) == []
+    
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 100)
+    assert cache.get("track.gettoptags", {"artist": "A", "track": "T"}) is None
+    assert cache.get("artist.gettoptags", {"artist": "A"}) == ["Shoegaze"]
+    
+    monkeypatch.setattr(time, "time", lambda: now + 2000)
+    assert cache.get("artist.gettoptags", {"artist": "A"}) is None
+
+def test_cache_is_shared_between_connections(tmp_path):
+    path = str(tmp_path / "cache.db")
+    TagCache(path).set("album.gettoptags", {"artist": "A", "album": "B"}, ["Emo"])
+    assert TagCache(path).get("album.gettoptags", {"artist": "A", "album": "B"}) == ["Emo"]
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+    
+    def json(self):
+        return self.data
+
+@pytest.fixture
+def responses(monkeypatch):
+    """Answers requests.get with queued JSON bodies"""
+    requests = pytest.importorskip("requests")
+    queued = []
+    
+    def get(url, params=None, timeout=None):
+        return FakeResponse(queued.pop(0))
+    
+    monkeypatch.setattr(requests, "get", get)
+    return queued
+
+def test_not_found_is_cached_as_empty(tmp_path, responses):
+    client = LastfmClient("key", api_url="http://stub", cache=TagCache(str(tmp_path / "cache.db")))
+    responses.append({"error": 6, "message": "Track not found"})
+    
+    assert client.top_tags("track.gettoptags", artist="A", track="T") == []
+    assert client.top_tags("track.gettoptags", artist="A", track="T") == []
+    assert client.requests == 1
+
+def test_transient_errors_raise_and_are_not_cached(tmp_path, responses):
+    client = LastfmClient("key", api_url="http://stub", cache=TagCache(str(tmp_path / "cache.db")))
+    responses.append({"error": 29, "message": "Rate Limit Exceeded"})
+    responses.append({"toptags": {"tag": [{"name": "Emo"}]}})
+    
+    with pytest.raises(LastfmError) as error:
+        client.top_tags("artist.gettoptags", artist="A")
+    assert error.value.code == 29
+    assert client.top_tags("artist.gettoptags", artist="A") == ["Emo"]
+    assert client.requests == 2
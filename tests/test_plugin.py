@@ -0,0 +1,180 @@
+"""Tests for the lastfmbridge beets plugin"""
+
+import pytest
+
+pytest.importorskip("beets")
+
+from beets.importer import action
+from beets.library import Item, Library
+
+from beetsplug import lastfmbridge
+
+class FakeClient:
+    """Answers top tag requests from a {(method, artist, name): tags} table"""
+    
+    def __init__(self, tags):
+        self.tags = tags
+        self.calls = []
+    
+    def top_tags(self, method, **params):
+        name = params.get("album") or params.get("track")
+        self.calls.append((method, params["artist"], name))
+        return self.tags.get((method, params["artist"], name), [])
+
+class FakeTask:
+    def __init__(self, album=None, item=None, choice_flag=action.ASIS):
+        self.is_album = album is not None
+        self.album = album
+        self.item = item
+        self.choice_flag = choice_flag
+        self.apply = choice_flag == action.APPLY
+    
+    def imported_items(self):
+        return list(self.album.items())
+
+class FakeSession:
+    def __init__(self, write=True):
+        self.config = {'write': write}
+
+@pytest.fixture
+def plugin(monkeypatch):
+    monkeypatch.setenv("LASTFM_API_KEY", "test")
+    monkeypatch.setattr(lastfmbridge, "load_blacklist", lambda: {"contains": [], "exact": []})
+    monkeypatch.setattr(lastfmbridge, "load_genre_mapping", lambda: {})
+    
+    plugin = lastfmbridge.LastfmBridgePlugin()
+    plugin.load_rules()
+    plugin.config['force'] = False
+    plugin.config['track_lookups'] = True
+    return plugin
+
+@pytest.fixture
+def written(monkeypatch):
+    paths = []
+    monkeypatch.setattr(Item, "try_write", lambda self, *args, **kwargs: paths.append(self.title))
+    return paths
+
+@pytest.fixture
+def lib():
+    return Library(':memory:')
+
+def add_album(lib, tracks, albumartist, comp=False):
+    """tracks is a list of (title, artist, genre)"""
+    items = [
+        Item(title=title, artist=artist, albumartist=albumartist, album="Album",
+             genre=genre, comp=comp, path=f"/music/{title}.flac".encode())
+        for title, artist, genre in tracks
+    ]
+    return lib.add_album(items)
+
+def genres(album):
+    return {item.title: item.genre for item in album.items()}
+
+ALBUM_TAGS = {("album.gettoptags", "Band", "Album"): ["shoegaze", "dream pop"]}
+
+def test_untagged_album_gets_album_genres(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    album = add_album(lib, [("t1", "Band", ""), ("t2", "Band", "")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    album.load()
+    assert album.genre == "Shoegaze, Dream Pop"
+    assert genres(album) == {"t1": "Shoegaze, Dream Pop", "t2": "Shoegaze, Dream Pop"}
+    assert sorted(written) == ["t1", "t2"]
+
+def test_partly_tagged_album_keeps_existing_genres(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    album = add_album(lib, [("t1", "Band", ""), ("t2", "Band", "Post-Rock"), ("t3", "Band", "")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    assert genres(album) == {"t1": "Shoegaze, Dream Pop", "t2": "Post-Rock", "t3": "Shoegaze, Dream Pop"}
+    assert sorted(written) == ["t1", "t3"]
+
+def test_force_overwrites_existing_genres(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    plugin.config['force'] = True
+    album = add_album(lib, [("t1", "Band", "Rock"), ("t2", "Band", "Post-Rock")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    assert genres(album) == {"t1": "Shoegaze, Dream Pop", "t2": "Shoegaze, Dream Pop"}
+
+def test_tagged_album_is_not_looked_up(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    album = add_album(lib, [("t1", "Band", "Rock")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    assert plugin.client.calls == []
+    assert written == []
+
+def test_album_falls_back_to_album_artist(plugin, lib, written):
+    plugin.client = FakeClient({("artist.gettoptags", "Band", None): ["emo"]})
+    album = add_album(lib, [("t1", "Band", "")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    assert genres(album) == {"t1": "Emo"}
+
+def test_compilation_never_uses_various_artists(plugin, lib, written):
+    plugin.client = FakeClient({
+        ("artist.gettoptags", "Various Artists", None): ["compilation", "various"],
+        ("track.gettoptags", "P", "t1"): ["trip-hop", "downtempo"],
+        ("artist.gettoptags", "Q", None): ["darkwave"],
+        ("album.gettoptags", "Various Artists", "Album"): ["soundtrack"]
+    })
+    album = add_album(lib, [("t1", "P", ""), ("t2", "Q", ""), ("t3", "R", ""), ("t4", "Q", "Rock")],
+                      "Various Artists", comp=True)
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    # Track tags, then the track artist, then the album; existing genres stay
+    assert genres(album) == {"t1": "Trip-Hop, Downtempo", "t2": "Darkwave", "t3": "Soundtrack", "t4": "Rock"}
+    assert ("artist.gettoptags", "Various Artists", None) not in plugin.client.calls
+    assert sorted(written) == ["t1", "t2", "t3"]
+
+def test_multi_artist_album_is_tagged_per_track(plugin, lib, written):
+    plugin.client = FakeClient({
+        ("album.gettoptags", "P", "Album"): ["shoegaze"],
+        ("artist.gettoptags", "Q", None): ["darkwave"]
+    })
+    album = add_album(lib, [("t1", "P", ""), ("t2", "Q", "")], "P")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album))
+    
+    assert genres(album) == {"t1": "Shoegaze", "t2": "Darkwave"}
+
+def test_singleton_track_then_artist(plugin, lib, written):
+    plugin.client = FakeClient({
+        ("track.gettoptags", "P", "t1"): ["trip-hop", "downtempo"],
+        ("artist.gettoptags", "Q", None): ["darkwave"]
+    })
+    first = Item(title="t1", artist="P", genre="")
+    second = Item(title="t2", artist="Q", genre="")
+    tagged = Item(title="t3", artist="Q", genre="Rock")
+    for item in (first, second, tagged):
+        lib.add(item)
+        plugin.imported(FakeSession(), FakeTask(item=item))
+    
+    assert (first.genre, second.genre, tagged.genre) == ("Trip-Hop, Downtempo", "Darkwave", "Rock")
+    assert written == ["t1", "t2"]
+
+def test_applied_import_is_left_to_beets(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    album = add_album(lib, [("t1", "Band", "")], "Band")
+    
+    plugin.imported(FakeSession(), FakeTask(album=album, choice_flag=action.APPLY))
+    
+    assert genres(album) == {"t1": "Shoegaze, Dream Pop"}
+    assert written == []
+
+def test_no_write_without_import_write(plugin, lib, written):
+    plugin.client = FakeClient(ALBUM_TAGS)
+    album = add_album(lib, [("t1", "Band", "")], "Band")
+    
+    plugin.imported(FakeSession(write=False), FakeTask(album=album))
+    
+    assert genres(album) == {"t1": "Shoegaze, Dream Pop"}
+    assert written == []
@@ -0,0 +1,112 @@
+"""Tests for the sharded genre finder"""
+
+import os
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from beets_lastfm_bridge import config, library, sharded
+from beets_lastfm_bridge.finder import get_genres_from_lastfm
+from beets_lastfm_bridge.sharded import partition, shard_for
+from beets_lastfm_bridge.stub_server import StubHandler, stub_tags
+
+TRACK_HIT_RATE = 0.3
+
+def make_tracks():
+    tracks = []
+    for i in range(60):
+        artist = f"Artist {i % 11}"
+        tracks.append({
+            'id': str(i),
+            'artist': artist.upper() if i % 5 == 0 else artist,
+            'title': f"Song {i}",
+            'album': f"Album {i % 3}"
+        })
+    return tracks
+
+class CountingClient:
+    """Answers like the stub server and remembers each distinct request"""
+    
+    def __init__(self):
+        self.requested = set()
+    
+    def top_tags(self, method, **params):
+        self.requested.add((method, tuple(sorted((k, v.lower()) for k, v in params.items()))))
+        return stub_tags(method, params, TRACK_HIT_RATE) or []
+
+def expected_requests(tracks):
+    """Requests a cached run sends for tracks, each distinct request once"""
+    client = CountingClient()
+    empty = {"contains": [], "exact": []}
+    for track in tracks:
+        get_genres_from_lastfm(track['artist'], track['title'], track['album'],
+                               blacklist=empty, mapping={}, client=client)
+    return len(client.requested)
+
+def test_shard_for_is_stable_and_case_insensitive():
+    assert shard_for("Architects", 4) == shard_for("ARCHITECTS", 4)
+    assert shard_for("Architects", 4) == shard_for("Architects", 4)
+    assert 0 <= shard_for("Architects", 4) < 4
+
+def test_partition_keeps_each_album_artist_in_one_shard():
+    tracks = make_tracks()
+    shards = partition(tracks, 3)
+    
+    assert sorted(track['id'] for shard in shards for track in shard) == sorted(t['id'] for t in tracks)
+    shards_by_artist = {}
+    for number, shard in enumerate(shards):
+        for track in shard:
+            shards_by_artist.setdefault(track['artist'].lower(), set()).add(number)
+    assert all(len(numbers) == 1 for numbers in shards_by_artist.values())
+    assert len({number for numbers in shards_by_artist.values() for number in numbers}) > 1
+
+@pytest.fixture
+def stub_server():
+    pytest.importorskip("requests")
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.requests = {}
+    server.latency = 0
+    server.track_hit_rate = TRACK_HIT_RATE
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    """Points the config files of this process and of workers to tmp_path"""
+    directory = tmp_path / ".config" / "beets"
+    directory.mkdir(parents=True)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setattr(config, "MAPPING_FILE", str(directory / "genre_mapping.json"))
+    monkeypatch.setattr(config, "BLACKLIST_FILE", str(directory / "genre_blacklist.json"))
+    monkeypatch.setattr(sharded, "STATS_FILE", str(directory / "lookup_stats.json"))
+    return directory
+
+def test_run_merges_shards_into_one_commit(stub_server, config_dir, monkeypatch):
+    tracks = make_tracks()
+    commits = []
+    monkeypatch.setattr(sharded, "get_tracks_without_genres", lambda: tracks)
+    monkeypatch.setattr(library, "set_genres", lambda genres: commits.append(dict(genres)) or len(genres))
+    
+    assert sharded.run(
+        ["key-a", "key-b"], 3, adaptive=False,
+        api_url=f"http://127.0.0.1:{stub_server.server_port}/2.0/",
+        cache_path=str(config_dir / "cache.db"), rate=0
+    )
+    
+    # Album tags always exist in the stub, so every track gets genres
+    assert len(commits) == 1
+    assert sorted(commits[0]) == sorted(track['id'] for track in tracks)
+    assert os.path.exists(sharded.STATS_FILE)
+    
+    # Shards 0 and 2 use the first key, shard 1 the second
+    shards = partition(tracks, 3)
+    assert all(shards)
+    assert stub_server.requests == {
+        "key-a": expected_requests(shards[0]) + expected_requests(shards[2]),
+        "key-b": expected_requests(shards[1])
+    }